@@ -1,20 +1,74 @@
 import sqlite3
 import json
+import re
+import time
 import uuid
-from datetime import datetime, timedelta
+import threading
+from collections.abc import Mapping
 from typing import List, Dict, Optional
 import os
 
+class MemoryView(Mapping):
+    """Read-only dict-like view over a memory row.
+
+    Wraps the sqlite3.Row directly instead of copying it into a dict, and
+    only decodes the tags JSON the first time a caller asks for it — most
+    callers never do, so bulk reads skip the parse entirely.
+    """
+
+    _KEYS = ('id', 'content', 'context', 'created_at', 'last_accessed',
+             'access_count', 'tags', 'importance_score')
+
+    __slots__ = ('_row', '_tags')
+
+    def __init__(self, row: sqlite3.Row):
+        self._row = row
+        self._tags = None
+
+    def __getitem__(self, key):
+        if key == 'tags':
+            if self._tags is None:
+                raw = self._row['tags']
+                self._tags = json.loads(raw) if raw else []
+            return self._tags
+        if key == 'content':
+            return self._row['memory_content']
+        if key in self._KEYS:
+            return self._row[key]
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._KEYS)
+
+    def __len__(self):
+        return len(self._KEYS)
+
+    def __repr__(self):
+        return f'MemoryView({dict(self)!r})'
+
 class MemoryDatabase:
     def __init__(self, db_path: str = "memory_database.db"):
         self.db_path = db_path
+
+        # One persistent connection instead of connect/close per call.
+        # Autocommit (isolation_level=None) + WAL keeps writes cheap;
+        # the lock serializes writers since sqlite3 connections aren't
+        # thread-safe for concurrent use.
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('PRAGMA temp_store=MEMORY')
+        self._conn.execute('PRAGMA mmap_size=268435456')
+        self._lock = threading.RLock()
+
         self.init_database()
-    
+
     def init_database(self):
         """Initialize the database with required tables"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+        cursor = self._conn.cursor()
+
         # Create memories table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS memories (
@@ -26,9 +80,22 @@ class MemoryDatabase:
                 last_accessed TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 access_count INTEGER DEFAULT 0,
                 tags TEXT,
-                importance_score REAL DEFAULT 0.5
+                importance_score REAL DEFAULT 0.5,
+                embedding BLOB,
+                created_at_epoch INTEGER
             )
         ''')
+
+        # Add columns to databases created before they existed
+        columns = [row[1] for row in cursor.execute('PRAGMA table_info(memories)')]
+        if 'embedding' not in columns:
+            cursor.execute('ALTER TABLE memories ADD COLUMN embedding BLOB')
+        if 'created_at_epoch' not in columns:
+            cursor.execute('ALTER TABLE memories ADD COLUMN created_at_epoch INTEGER')
+        cursor.execute('''
+            UPDATE memories SET created_at_epoch = strftime('%s', created_at)
+            WHERE created_at_epoch IS NULL
+        ''')
         
         # Create conversations table
         cursor.execute('''
@@ -41,39 +108,112 @@ class MemoryDatabase:
             )
         ''')
         
-        # Create indexes for better performance
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_memories ON memories(user_id)')
+        # Create indexes for better performance. The composite indexes match
+        # get_memories' ORDER BY and the cleanup path directly, so SQLite can
+        # serve the LIMIT from an index seek instead of sorting every row;
+        # they also cover plain user_id lookups, so the old single-column
+        # index is redundant.
+        cursor.execute('DROP INDEX IF EXISTS idx_user_memories')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_user_order
+            ON memories(user_id, importance_score DESC, last_accessed DESC)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_user_created
+            ON memories(user_id, created_at DESC)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_user_access
+            ON memories(user_id, access_count DESC)
+        ''')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_conversations ON conversations(user_id)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_memory_created ON memories(created_at)')
-        
-        conn.commit()
-        conn.close()
-    
-    def create_memory(self, user_id: str, memory_content: str, context: str = "", 
-                     tags: List[str] = None, importance_score: float = 0.5) -> str:
+        cursor.execute('DROP INDEX IF EXISTS idx_memory_created')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_memory_epoch ON memories(created_at_epoch)')
+
+        # Full-text index over memory text; an inverted index makes search
+        # O(log N + hits) instead of a LIKE '%...%' table scan
+        cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS memories_fts USING fts5(
+                memory_content, context,
+                content='memories', content_rowid='rowid',
+                tokenize='porter unicode61'
+            )
+        ''')
+
+        # Triggers keep the FTS index in sync with the memories table
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS memories_fts_insert AFTER INSERT ON memories BEGIN
+                INSERT INTO memories_fts(rowid, memory_content, context)
+                VALUES (new.rowid, new.memory_content, new.context);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS memories_fts_delete AFTER DELETE ON memories BEGIN
+                INSERT INTO memories_fts(memories_fts, rowid, memory_content, context)
+                VALUES ('delete', old.rowid, old.memory_content, old.context);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS memories_fts_update AFTER UPDATE OF memory_content, context ON memories BEGIN
+                INSERT INTO memories_fts(memories_fts, rowid, memory_content, context)
+                VALUES ('delete', old.rowid, old.memory_content, old.context);
+                INSERT INTO memories_fts(rowid, memory_content, context)
+                VALUES (new.rowid, new.memory_content, new.context);
+            END
+        ''')
+
+        # Backfill the index for databases created before FTS existed
+        fts_rows = cursor.execute('SELECT count(*) FROM memories_fts').fetchone()[0]
+        memory_rows = cursor.execute('SELECT count(*) FROM memories').fetchone()[0]
+        if fts_rows != memory_rows:
+            cursor.execute("INSERT INTO memories_fts(memories_fts) VALUES ('rebuild')")
+
+    @staticmethod
+    def _fts_match_expression(query: str) -> str:
+        """Turn a free-text query into an FTS5 MATCH expression (prefix search)"""
+        tokens = re.findall(r'\w+', query)
+        return ' '.join(f'"{token}"*' for token in tokens)
+
+    def create_memory(self, user_id: str, memory_content: str, context: str = "",
+                     tags: List[str] = None, importance_score: float = 0.5,
+                     embedding: bytes = None) -> str:
         """Create a new memory entry"""
         memory_id = str(uuid.uuid4())
         tags_json = json.dumps(tags) if tags else json.dumps([])
-        
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO memories (id, user_id, memory_content, context, tags, importance_score)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (memory_id, user_id, memory_content, context, tags_json, importance_score))
-        
-        conn.commit()
-        conn.close()
-        
+
+        with self._lock:
+            self._conn.execute('''
+                INSERT INTO memories (id, user_id, memory_content, context, tags, importance_score, embedding, created_at_epoch)
+                VALUES (?, ?, ?, ?, ?, ?, ?, strftime('%s', 'now'))
+            ''', (memory_id, user_id, memory_content, context, tags_json, importance_score, embedding))
+
         return memory_id
-    
+
+    def create_memories_bulk(self, rows: List[tuple]):
+        """Insert several memories in one transaction.
+
+        Each row is (id, user_id, memory_content, context, tags_json,
+        importance_score, embedding). One commit instead of one per
+        memory keeps multi-memory turns cheap.
+        """
+        if not rows:
+            return
+
+        with self._lock:
+            try:
+                self._conn.execute('BEGIN')
+                self._conn.executemany('''
+                    INSERT INTO memories (id, user_id, memory_content, context, tags, importance_score, embedding, created_at_epoch)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, strftime('%s', 'now'))
+                ''', rows)
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+
     def get_memories(self, user_id: str, limit: int = 10) -> List[Dict]:
         """Retrieve memories for a user, ordered by importance and recency"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
+        cursor = self._conn.execute('''
             SELECT id, memory_content, context, created_at, last_accessed, 
                    access_count, tags, importance_score
             FROM memories 
@@ -82,148 +222,218 @@ class MemoryDatabase:
             LIMIT ?
         ''', (user_id, limit))
         
-        memories = []
-        for row in cursor.fetchall():
-            memory = {
-                'id': row[0],
-                'content': row[1],
-                'context': row[2],
-                'created_at': row[3],
-                'last_accessed': row[4],
-                'access_count': row[5],
-                'tags': json.loads(row[6]) if row[6] else [],
-                'importance_score': row[7]
-            }
-            memories.append(memory)
-        
-        conn.close()
-        return memories
-    
+        return [MemoryView(row) for row in cursor.fetchall()]
+
     def search_memories(self, user_id: str, query: str, limit: int = 5) -> List[Dict]:
         """Search memories by content"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        match_expr = self._fts_match_expression(query)
+        cursor = None
+        if match_expr:
+            try:
+                cursor = self._conn.execute('''
+                    SELECT memories.id, memories.memory_content, memories.context,
+                           memories.created_at, memories.last_accessed,
+                           memories.access_count, memories.tags, memories.importance_score
+                    FROM memories
+                    JOIN memories_fts ON memories.rowid = memories_fts.rowid
+                    WHERE memories.user_id = ? AND memories_fts MATCH ?
+                    ORDER BY memories.importance_score DESC, memories.last_accessed DESC
+                    LIMIT ?
+                ''', (user_id, match_expr, limit))
+            except sqlite3.OperationalError:
+                cursor = None  # unparseable MATCH expression, fall back to LIKE
+
+        if cursor is None:
+            cursor = self._conn.execute('''
+                SELECT id, memory_content, context, created_at, last_accessed,
+                       access_count, tags, importance_score
+                FROM memories
+                WHERE user_id = ? AND (memory_content LIKE ? OR context LIKE ?)
+                ORDER BY importance_score DESC, last_accessed DESC
+                LIMIT ?
+            ''', (user_id, f'%{query}%', f'%{query}%', limit))
         
-        cursor.execute('''
-            SELECT id, memory_content, context, created_at, last_accessed, 
+        return [MemoryView(row) for row in cursor.fetchall()]
+
+    def get_memory_embeddings(self, user_id: str) -> List[tuple]:
+        """Retrieve (memory_id, embedding) pairs for a user's embedded memories"""
+        cursor = self._conn.execute('''
+            SELECT id, embedding FROM memories
+            WHERE user_id = ? AND embedding IS NOT NULL
+        ''', (user_id,))
+
+        return [(row[0], row[1]) for row in cursor.fetchall()]
+
+    def get_memories_by_ids(self, memory_ids: List[str]) -> List[Dict]:
+        """Retrieve specific memories, preserving the order of memory_ids"""
+        if not memory_ids:
+            return []
+
+        placeholders = ','.join('?' * len(memory_ids))
+        cursor = self._conn.execute(f'''
+            SELECT id, memory_content, context, created_at, last_accessed,
                    access_count, tags, importance_score
-            FROM memories 
-            WHERE user_id = ? AND (memory_content LIKE ? OR context LIKE ?)
-            ORDER BY importance_score DESC, last_accessed DESC
-            LIMIT ?
-        ''', (user_id, f'%{query}%', f'%{query}%', limit))
-        
-        memories = []
-        for row in cursor.fetchall():
-            memory = {
-                'id': row[0],
-                'content': row[1],
-                'context': row[2],
-                'created_at': row[3],
-                'last_accessed': row[4],
-                'access_count': row[5],
-                'tags': json.loads(row[6]) if row[6] else [],
-                'importance_score': row[7]
-            }
-            memories.append(memory)
-        
-        conn.close()
-        return memories
-    
+            FROM memories
+            WHERE id IN ({placeholders})
+        ''', memory_ids)
+
+        by_id = {row['id']: MemoryView(row) for row in cursor.fetchall()}
+
+        return [by_id[memory_id] for memory_id in memory_ids if memory_id in by_id]
+
+    def get_memory_stats(self, user_id: str, recent_cutoff_epoch: int) -> Dict:
+        """Aggregate memory statistics for a user in a single query"""
+        row = self._conn.execute('''
+            SELECT COUNT(*) AS total,
+                   AVG(importance_score) AS avg_importance,
+                   SUM(CASE WHEN created_at_epoch > ? THEN 1 ELSE 0 END) AS recent
+            FROM memories
+            WHERE user_id = ?
+        ''', (recent_cutoff_epoch, user_id)).fetchone()
+
+        return {
+            'total_memories': row['total'],
+            'avg_importance': row['avg_importance'] or 0,
+            'recent_memories': row['recent'] or 0
+        }
+
+    def get_most_accessed_memory(self, user_id: str) -> Optional[MemoryView]:
+        """Retrieve the user's most frequently accessed memory"""
+        row = self._conn.execute('''
+            SELECT id, memory_content, context, created_at, last_accessed,
+                   access_count, tags, importance_score
+            FROM memories
+            WHERE user_id = ?
+            ORDER BY access_count DESC
+            LIMIT 1
+        ''', (user_id,)).fetchone()
+
+        return MemoryView(row) if row else None
+
+    def reinforce_memory(self, memory_id: str, importance_score: float = 0.5,
+                         tags: List[str] = None) -> bool:
+        """Refresh an existing memory in place of inserting a near-duplicate.
+
+        Bumps the access count and recency, keeps the higher importance
+        score, and merges in any new tags. Returns False when the memory
+        no longer exists, so callers can insert instead.
+        """
+        with self._lock:
+            if tags:
+                row = self._conn.execute(
+                    'SELECT tags FROM memories WHERE id = ?', (memory_id,)).fetchone()
+                if row:
+                    existing = json.loads(row['tags']) if row['tags'] else []
+                    merged = existing + [tag for tag in tags if tag not in existing]
+                    self._conn.execute('UPDATE memories SET tags = ? WHERE id = ?',
+                                       (json.dumps(merged), memory_id))
+
+            cursor = self._conn.execute('''
+                UPDATE memories
+                SET last_accessed = CURRENT_TIMESTAMP,
+                    access_count = access_count + 1,
+                    importance_score = max(importance_score, ?)
+                WHERE id = ?
+            ''', (importance_score, memory_id))
+
+            return cursor.rowcount > 0
+
     def update_memory_access(self, memory_id: str):
         """Update memory access timestamp and count"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            UPDATE memories 
-            SET last_accessed = CURRENT_TIMESTAMP, access_count = access_count + 1
-            WHERE id = ?
-        ''', (memory_id,))
-        
-        conn.commit()
-        conn.close()
-    
+        with self._lock:
+            self._conn.execute('''
+                UPDATE memories
+                SET last_accessed = CURRENT_TIMESTAMP, access_count = access_count + 1
+                WHERE id = ?
+            ''', (memory_id,))
+
+    def update_memory_access_many(self, memory_ids: List[str]):
+        """Update access timestamp and count for several memories in one statement"""
+        if not memory_ids:
+            return
+
+        placeholders = ','.join('?' * len(memory_ids))
+        with self._lock:
+            self._conn.execute(f'''
+                UPDATE memories
+                SET last_accessed = CURRENT_TIMESTAMP, access_count = access_count + 1
+                WHERE id IN ({placeholders})
+            ''', memory_ids)
+
     def delete_memory(self, user_id: str, memory_id: str) -> bool:
         """Delete a specific memory"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('DELETE FROM memories WHERE id = ? AND user_id = ?', (memory_id, user_id))
-        deleted = cursor.rowcount > 0
-        
-        conn.commit()
-        conn.close()
-        
-        return deleted
-    
+        with self._lock:
+            cursor = self._conn.execute(
+                'DELETE FROM memories WHERE id = ? AND user_id = ?', (memory_id, user_id))
+            return cursor.rowcount > 0
+
     def delete_user_memories(self, user_id: str, keyword: str = None) -> int:
         """Delete memories for a user, optionally filtered by keyword"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        if keyword:
-            cursor.execute('''
-                DELETE FROM memories 
-                WHERE user_id = ? AND (memory_content LIKE ? OR context LIKE ?)
-            ''', (user_id, f'%{keyword}%', f'%{keyword}%'))
-        else:
-            cursor.execute('DELETE FROM memories WHERE user_id = ?', (user_id,))
-        
-        deleted_count = cursor.rowcount
-        conn.commit()
-        conn.close()
-        
-        return deleted_count
-    
+        with self._lock:
+            if keyword is None:
+                cursor = self._conn.execute('DELETE FROM memories WHERE user_id = ?', (user_id,))
+            elif '%' not in keyword and '_' not in keyword:
+                # Fixed substring: instr() is a plain (case-folded) substring
+                # search without the LIKE pattern machinery
+                lowered = keyword.lower()
+                cursor = self._conn.execute('''
+                    DELETE FROM memories
+                    WHERE user_id = ? AND (instr(lower(memory_content), ?) > 0
+                                           OR instr(lower(context), ?) > 0)
+                ''', (user_id, lowered, lowered))
+            else:
+                cursor = self._conn.execute('''
+                    DELETE FROM memories
+                    WHERE user_id = ? AND (memory_content LIKE ? OR context LIKE ?)
+                ''', (user_id, f'%{keyword}%', f'%{keyword}%'))
+
+            return cursor.rowcount
+
     def save_conversation(self, user_id: str, conversation_data: Dict) -> str:
         """Save conversation data"""
         conversation_id = str(uuid.uuid4())
-        
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO conversations (id, user_id, conversation_data)
-            VALUES (?, ?, ?)
-        ''', (conversation_id, user_id, json.dumps(conversation_data)))
-        
-        conn.commit()
-        conn.close()
-        
+
+        with self._lock:
+            self._conn.execute('''
+                INSERT INTO conversations (id, user_id, conversation_data)
+                VALUES (?, ?, ?)
+            ''', (conversation_id, user_id, json.dumps(conversation_data)))
+
         return conversation_id
-    
+
     def get_conversation(self, user_id: str, conversation_id: str) -> Optional[Dict]:
         """Retrieve a specific conversation"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT conversation_data FROM conversations 
+        cursor = self._conn.execute('''
+            SELECT conversation_data FROM conversations
             WHERE id = ? AND user_id = ?
         ''', (conversation_id, user_id))
-        
+
         result = cursor.fetchone()
-        conn.close()
-        
+
         if result:
             return json.loads(result[0])
         return None
-    
+
     def cleanup_old_memories(self, days: int = 365):
         """Clean up old memories based on retention policy"""
-        cutoff_date = datetime.now() - timedelta(days=days)
-        
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            DELETE FROM memories 
-            WHERE created_at < ? AND importance_score < 0.7
-        ''', (cutoff_date.isoformat(),))
-        
-        deleted_count = cursor.rowcount
-        conn.commit()
-        conn.close()
-        
-        return deleted_count
+        cutoff_epoch = int(time.time()) - days * 86400
+
+        with self._lock:
+            cursor = self._conn.execute('''
+                DELETE FROM memories
+                WHERE created_at_epoch < ? AND importance_score < 0.7
+            ''', (cutoff_epoch,))
+            deleted_count = cursor.rowcount
+
+            # Piggyback maintenance on the cleanup path: bulk deletes
+            # leave the planner with stale stats and let the WAL grow
+            if deleted_count:
+                self._conn.execute('ANALYZE memories')
+            self._conn.execute('PRAGMA optimize')
+            self._conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+
+            return deleted_count
+
+    def close(self):
+        """Close the underlying connection"""
+        self._conn.close()
@@ -0,0 +1,66 @@
+import hashlib
+import re
+import numpy as np
+
+# Dimension of the hashed embedding space. 384 keeps vectors small while
+# leaving few hash collisions for typical short memory texts.
+EMBEDDING_DIM = 384
+
+# Minimum cosine similarity for a memory to count as semantically relevant.
+# Hashed bag-of-words embeddings score paraphrases lower than learned
+# models do, so this sits well below thresholds used with neural encoders.
+SIMILARITY_THRESHOLD = 0.25
+
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+
+
+def _tokens(text: str):
+    """Tokenize text into lowercase words plus adjacent-word bigrams"""
+    words = _TOKEN_RE.findall(text.lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def embed_text(text: str) -> np.ndarray:
+    """Embed text as an L2-normalized float32 vector using the hashing trick.
+
+    Each token is hashed to a bucket with a +/-1 sign, so cosine similarity
+    between two vectors approximates token overlap between the texts. This
+    is a deterministic, dependency-free stand-in for a learned embedding.
+    """
+    vec = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+    for token in _tokens(text):
+        digest = hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest()
+        h = int.from_bytes(digest, 'little')
+        vec[h % EMBEDDING_DIM] += 1.0 if h & (1 << 63) else -1.0
+
+    norm = np.linalg.norm(vec)
+    if norm > 0:
+        vec /= norm
+    return vec
+
+
+def quantize_vector(vec: np.ndarray) -> np.ndarray:
+    """Quantize an L2-normalized float vector to int8 in [-127, 127]"""
+    return np.clip(np.rint(vec * 127.0), -127, 127).astype(np.int8)
+
+
+def dot_similarity(matrix: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """Cosine similarity between int8 quantized rows and an int8 quantized query.
+
+    Products are accumulated in int32 (int8 dot products overflow int16
+    at this dimension), then rescaled back to the [-1, 1] cosine range.
+    """
+    return (matrix.astype(np.int32) @ query.astype(np.int32)) / (127.0 * 127.0)
+
+
+def vector_to_blob(vec: np.ndarray) -> bytes:
+    """Serialize an embedding as int8 for storage in a BLOB column"""
+    return quantize_vector(vec).tobytes()
+
+
+def blob_to_vector(blob: bytes) -> np.ndarray:
+    """Deserialize an int8 embedding stored via vector_to_blob"""
+    if len(blob) == EMBEDDING_DIM * 4:
+        # Legacy float32 blob from before quantization; requantize on read
+        return quantize_vector(np.frombuffer(blob, dtype=np.float32))
+    return np.frombuffer(blob, dtype=np.int8)
@@ -1,236 +1,429 @@
-import openai
-import re
-from typing import List, Dict, Optional, Tuple
-from database import MemoryDatabase
-import os
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
-
-class MemoryManager:
-    def __init__(self, api_key: str = None, db_path: str = None):
-        api_key = api_key or os.getenv('OPENAI_API_KEY')
-        if api_key and api_key != 'your_openai_api_key_here':
-            try:
-                self.client = openai.OpenAI(api_key=api_key)
-            except Exception as e:
-                print(f"Warning: OpenAI client initialization failed: {e}")
-                self.client = None
-        else:
-            print("Warning: No valid OpenAI API key found. Chat functionality will be limited.")
-            self.client = None
-        
-        self.db = MemoryDatabase(db_path or os.getenv('DATABASE_PATH', 'memory_database.db'))
-        
-    def extract_memories_from_text(self, text: str, user_id: str) -> List[str]:
-        """Extract potential memories from user input using pattern matching"""
-        memory_patterns = [
-            r"I (?:use|work with|like|prefer|have|am|do) (.+)",
-            r"My (.+) is (.+)",
-            r"I don't (?:use|like|want|have) (.+)",
-            r"Remember that (.+)",
-            r"(?:FYI|Note|Important): (.+)",
-        ]
-        
-        memories = []
-        for pattern in memory_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                if isinstance(match, tuple):
-                    memory = " ".join(match)
-                else:
-                    memory = match
-                
-                if len(memory.strip()) > 5:  # Only meaningful memories
-                    memories.append(memory.strip())
-        
-        return memories
-    
-    def analyze_importance(self, memory_content: str, context: str = "") -> float:
-        """Analyze the importance of a memory using simple heuristics"""
-        importance_score = 0.5  # Base score
-        
-        # Keywords that indicate high importance
-        high_importance_keywords = [
-            'important', 'critical', 'always', 'never', 'prefer', 'hate', 
-            'love', 'essential', 'must', 'required', 'need'
-        ]
-        
-        # Keywords that indicate medium importance
-        medium_importance_keywords = [
-            'like', 'use', 'work', 'project', 'team', 'company', 'usually'
-        ]
-        
-        text_to_analyze = (memory_content + " " + context).lower()
-        
-        # Check for high importance keywords
-        for keyword in high_importance_keywords:
-            if keyword in text_to_analyze:
-                importance_score += 0.2
-        
-        # Check for medium importance keywords
-        for keyword in medium_importance_keywords:
-            if keyword in text_to_analyze:
-                importance_score += 0.1
-        
-        # Length-based scoring (longer memories might be more detailed/important)
-        if len(memory_content) > 100:
-            importance_score += 0.1
-        
-        # Cap the score at 1.0
-        return min(importance_score, 1.0)
-    
-    def create_memory(self, user_id: str, memory_content: str, context: str = "", 
-                     tags: List[str] = None) -> str:
-        """Create a new memory with automatic importance scoring"""
-        importance_score = self.analyze_importance(memory_content, context)
-        
-        memory_id = self.db.create_memory(
-            user_id=user_id,
-            memory_content=memory_content,
-            context=context,
-            tags=tags or [],
-            importance_score=importance_score
-        )
-        
-        return memory_id
-    
-    def process_user_input(self, user_id: str, user_input: str, context: str = "") -> List[str]:
-        """Process user input and automatically create memories"""
-        extracted_memories = self.extract_memories_from_text(user_input, user_id)
-        created_memory_ids = []
-        
-        for memory_content in extracted_memories:
-            memory_id = self.create_memory(
-                user_id=user_id,
-                memory_content=memory_content,
-                context=f"From conversation: {context}"
-            )
-            created_memory_ids.append(memory_id)
-        
-        return created_memory_ids
-    
-    def get_relevant_memories(self, user_id: str, query: str = "", limit: int = 5) -> List[Dict]:
-        """Get relevant memories for context"""
-        if query:
-            # Search for specific memories
-            memories = self.db.search_memories(user_id, query, limit)
-        else:
-            # Get recent important memories
-            memories = self.db.get_memories(user_id, limit)
-        
-        # Update access count for retrieved memories
-        for memory in memories:
-            self.db.update_memory_access(memory['id'])
-        
-        return memories
-    
-    def format_memories_for_context(self, memories: List[Dict]) -> str:
-        """Format memories for inclusion in GPT context"""
-        if not memories:
-            return ""
-        
-        context_parts = ["Here's what I remember about you:"]
-        
-        for memory in memories:
-            context_parts.append(f"- {memory['content']}")
-            if memory['tags']:
-                context_parts.append(f"  (Tags: {', '.join(memory['tags'])})")
-        
-        return "\n".join(context_parts)
-    
-    def chat_with_memory(self, user_id: str, user_message: str, 
-                        conversation_history: List[Dict] = None) -> Tuple[str, List[str]]:
-        """Chat with GPT while incorporating memory context"""
-        
-        # Process user input for new memories
-        new_memory_ids = self.process_user_input(user_id, user_message)
-        
-        # Get relevant memories for context
-        relevant_memories = self.get_relevant_memories(user_id, user_message, limit=5)
-        memory_context = self.format_memories_for_context(relevant_memories)
-        
-        # Check if OpenAI client is available
-        if not self.client:
-            return ("OpenAI API key not configured. Please add your API key to the .env file. "
-                   f"However, I created {len(new_memory_ids)} memories from your message: '{user_message}'"), new_memory_ids
-        
-        # Prepare messages for GPT
-        messages = []
-        
-        # Add system message with memory context
-        system_message = "You are a helpful assistant with access to user memories."
-        if memory_context:
-            system_message += f"\n\n{memory_context}"
-        
-        messages.append({"role": "system", "content": system_message})
-        
-        # Add conversation history if provided
-        if conversation_history:
-            messages.extend(conversation_history)
-        
-        # Add current user message
-        messages.append({"role": "user", "content": user_message})
-        
-        # Get response from GPT
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=messages,
-                max_tokens=500,
-                temperature=0.7
-            )
-            
-            assistant_response = response.choices[0].message.content
-            
-            # Process assistant response for potential memories
-            assistant_memory_ids = self.process_user_input(
-                user_id, 
-                assistant_response, 
-                context="Assistant response"
-            )
-            
-            all_new_memory_ids = new_memory_ids + assistant_memory_ids
-            
-            return assistant_response, all_new_memory_ids
-            
-        except Exception as e:
-            return f"Error communicating with OpenAI: {str(e)}. Please check your API key and internet connection.", new_memory_ids
-    
-    def delete_memories_by_keyword(self, user_id: str, keyword: str) -> int:
-        """Delete memories containing a specific keyword"""
-        return self.db.delete_user_memories(user_id, keyword)
-    
-    def get_user_memory_stats(self, user_id: str) -> Dict:
-        """Get statistics about user's memories"""
-        all_memories = self.db.get_memories(user_id, limit=1000)
-        
-        if not all_memories:
-            return {
-                'total_memories': 0,
-                'avg_importance': 0,
-                'most_accessed': None,
-                'recent_memories': 0
-            }
-        
-        total_memories = len(all_memories)
-        avg_importance = sum(m['importance_score'] for m in all_memories) / total_memories
-        most_accessed = max(all_memories, key=lambda x: x['access_count'])
-        
-        # Count recent memories (last 7 days)
-        from datetime import datetime, timedelta
-        week_ago = datetime.now() - timedelta(days=7)
-        recent_memories = sum(1 for m in all_memories 
-                            if datetime.fromisoformat(m['created_at'].replace('Z', '+00:00')) > week_ago)
-        
-        return {
-            'total_memories': total_memories,
-            'avg_importance': round(avg_importance, 2),
-            'most_accessed': most_accessed,
-            'recent_memories': recent_memories
-        }
-    
-    def cleanup_old_memories(self, days: int = 365) -> int:
-        """Clean up old, low-importance memories"""
-        return self.db.cleanup_old_memories(days)
+import openai
+import re
+import json
+import time
+import uuid
+import numpy as np
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
+from database import MemoryDatabase
+from embeddings import (EMBEDDING_DIM, SIMILARITY_THRESHOLD, embed_text,
+                        blob_to_vector, quantize_vector, dot_similarity)
+import os
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# All extraction patterns fused into one alternation, compiled once at
+# import time: a single finditer pass walks the text once instead of
+# running five separate scans per chat turn
+_MEMORY_UNION = re.compile(
+    r"\bI (?:use|work with|like|prefer|have|am|do) (?P<p0>.+)"
+    r"|\bMy (?P<p1a>.+) is (?P<p1b>.+)"
+    r"|\bI don't (?:use|like|want|have) (?P<p2>.+)"
+    r"|\bRemember that (?P<p3>.+)"
+    r"|\b(?:FYI|Note|Important): (?P<p4>.+)",
+    re.IGNORECASE,
+)
+
+# Importance keywords as frozensets: tokenizing the text once and
+# intersecting beats any per-keyword scan, and whole-word matching is
+# what the scoring actually wants
+_HIGH_IMPORTANCE_KEYWORDS = frozenset([
+    'important', 'critical', 'always', 'never', 'prefer', 'hate',
+    'love', 'essential', 'must', 'required', 'need'
+])
+_MEDIUM_IMPORTANCE_KEYWORDS = frozenset([
+    'like', 'use', 'work', 'project', 'team', 'company', 'usually'
+])
+_WORD_RE = re.compile(r"[a-z']+")
+
+# Above this cosine similarity a new memory is treated as a restatement
+# of an existing one and reinforces it instead of being inserted
+_DUPLICATE_SIMILARITY_THRESHOLD = 0.95
+
+# A cached response is reused when a new question's embedding is at least
+# this similar to a previous one — high enough that only near-duplicate
+# phrasings hit the cache
+_CACHE_SIMILARITY_THRESHOLD = 0.87
+
+# Maximum number of cached (query, response) pairs before LRU eviction
+_CACHE_MAX_SIZE = 128
+
+# Pool for overlapping database writes with the OpenAI round-trip
+_EXECUTOR = ThreadPoolExecutor(max_workers=4)
+
+class MemoryManager:
+    def __init__(self, api_key: str = None, db_path: str = None):
+        api_key = api_key or os.getenv('OPENAI_API_KEY')
+        if api_key and api_key != 'your_openai_api_key_here':
+            try:
+                self.client = openai.OpenAI(api_key=api_key)
+            except Exception as e:
+                print(f"Warning: OpenAI client initialization failed: {e}")
+                self.client = None
+        else:
+            print("Warning: No valid OpenAI API key found. Chat functionality will be limited.")
+            self.client = None
+        
+        self.db = MemoryDatabase(db_path or os.getenv('DATABASE_PATH', 'memory_database.db'))
+
+        # Semantic LRU cache over GPT responses: (user_id, message) ->
+        # (query embedding, response). Near-duplicate questions skip the
+        # network round-trip entirely.
+        self._response_cache = OrderedDict()
+
+        # Per-user embedding matrix cache: one contiguous (N, dim) int8
+        # array per user so similarity is a single matmul, plus the
+        # parallel list of memory ids for each row
+        self._user_vecs: Dict[str, np.ndarray] = {}
+        self._user_vec_ids: Dict[str, List[str]] = {}
+
+    def _get_user_vectors(self, user_id: str) -> Tuple[List[str], np.ndarray]:
+        """Get the cached (ids, embedding matrix) pair for a user, loading on miss"""
+        if user_id not in self._user_vecs:
+            embedded = self.db.get_memory_embeddings(user_id)
+            self._user_vec_ids[user_id] = [memory_id for memory_id, _ in embedded]
+            if embedded:
+                self._user_vecs[user_id] = np.vstack(
+                    [blob_to_vector(blob) for _, blob in embedded])
+            else:
+                self._user_vecs[user_id] = np.empty((0, EMBEDDING_DIM), dtype=np.int8)
+
+        return self._user_vec_ids[user_id], self._user_vecs[user_id]
+
+    def _append_user_vectors(self, user_id: str, memory_ids: List[str], vecs: List[np.ndarray]):
+        """Append newly inserted embeddings to a user's cached matrix"""
+        if user_id not in self._user_vecs or not memory_ids:
+            return
+        self._user_vec_ids[user_id].extend(memory_ids)
+        self._user_vecs[user_id] = np.vstack([self._user_vecs[user_id]] + vecs)
+
+    def _find_duplicate_memory(self, user_id: str, vec: np.ndarray) -> Optional[str]:
+        """Find an existing memory that is a near-duplicate of the new vector"""
+        memory_ids, matrix = self._get_user_vectors(user_id)
+        if not memory_ids:
+            return None
+
+        similarities = dot_similarity(matrix, vec)
+        best = int(np.argmax(similarities))
+        if similarities[best] >= _DUPLICATE_SIMILARITY_THRESHOLD:
+            return memory_ids[best]
+        return None
+
+    def _invalidate_user_vectors(self, user_id: str = None):
+        """Drop cached embedding matrices after deletes"""
+        if user_id is None:
+            self._user_vecs.clear()
+            self._user_vec_ids.clear()
+        else:
+            self._user_vecs.pop(user_id, None)
+            self._user_vec_ids.pop(user_id, None)
+
+    def _get_cached_response(self, user_id: str, query_vec: np.ndarray) -> Optional[str]:
+        """Return a cached response semantically matching the query, if any"""
+        candidates = [(key, entry) for key, entry in self._response_cache.items()
+                      if key[0] == user_id]
+        if not candidates:
+            return None
+
+        matrix = np.vstack([entry[0] for _, entry in candidates])
+        similarities = dot_similarity(matrix, query_vec)
+        best = int(np.argmax(similarities))
+        if similarities[best] < _CACHE_SIMILARITY_THRESHOLD:
+            return None
+
+        key, entry = candidates[best]
+        self._response_cache.move_to_end(key)
+        return entry[1]
+
+    def _cache_response(self, user_id: str, user_message: str,
+                        query_vec: np.ndarray, response: str):
+        """Cache a response for semantic reuse, evicting the LRU entry if full"""
+        self._response_cache[(user_id, user_message)] = (query_vec, response)
+        self._response_cache.move_to_end((user_id, user_message))
+        if len(self._response_cache) > _CACHE_MAX_SIZE:
+            self._response_cache.popitem(last=False)
+
+    def extract_memories_from_text(self, text: str, user_id: str) -> List[str]:
+        """Extract potential memories from user input using pattern matching"""
+        memories = []
+        for match in _MEMORY_UNION.finditer(text):
+            groups = match.groupdict()
+            if groups['p1a'] is not None:
+                memory = f"{groups['p1a']} {groups['p1b']}"
+            else:
+                memory = groups['p0'] or groups['p2'] or groups['p3'] or groups['p4']
+
+            memory = memory.strip()
+            if len(memory) > 5:  # Only meaningful memories
+                memories.append(memory)
+
+        return memories
+    
+    def analyze_importance(self, memory_content: str, context: str = "") -> float:
+        """Analyze the importance of a memory using simple heuristics"""
+        importance_score = 0.5  # Base score
+
+        # Tokenize once, then keyword checks are O(1) set intersections;
+        # each keyword counts once however often it appears
+        tokens = frozenset(_WORD_RE.findall((memory_content + " " + context).lower()))
+        importance_score += 0.2 * len(_HIGH_IMPORTANCE_KEYWORDS & tokens)
+        importance_score += 0.1 * len(_MEDIUM_IMPORTANCE_KEYWORDS & tokens)
+
+        # Length-based scoring (longer memories might be more detailed/important)
+        if len(memory_content) > 100:
+            importance_score += 0.1
+        
+        # Cap the score at 1.0
+        return min(importance_score, 1.0)
+    
+    def create_memory(self, user_id: str, memory_content: str, context: str = "", 
+                     tags: List[str] = None) -> str:
+        """Create a new memory with automatic importance scoring"""
+        importance_score = self.analyze_importance(memory_content, context)
+        
+        vec = quantize_vector(embed_text(memory_content))
+
+        # Reinforce a near-identical existing memory instead of growing the
+        # store with restatements
+        duplicate_id = self._find_duplicate_memory(user_id, vec)
+        if duplicate_id is not None:
+            if self.db.reinforce_memory(duplicate_id, importance_score, tags):
+                return duplicate_id
+            # The matched row was deleted behind the cache (e.g. via a
+            # database-level delete); reload it and insert normally
+            self._invalidate_user_vectors(user_id)
+
+        memory_id = self.db.create_memory(
+            user_id=user_id,
+            memory_content=memory_content,
+            context=context,
+            tags=tags or [],
+            importance_score=importance_score,
+            embedding=vec.tobytes()
+        )
+        self._append_user_vectors(user_id, [memory_id], [vec])
+
+        return memory_id
+    
+    def _prepare_memory_rows(self, user_id: str, user_input: str, context: str = ""
+                             ) -> Tuple[List[str], List[tuple], List[np.ndarray], List[str]]:
+        """Extract memories and build insert-ready rows with ids and embeddings"""
+        extracted_memories = self.extract_memories_from_text(user_input, user_id)
+
+        memory_context = f"From conversation: {context}"
+        created_memory_ids = []
+        rows = []
+        vecs = []
+
+        for memory_content in extracted_memories:
+            vec = quantize_vector(embed_text(memory_content))
+
+            # Restatements reinforce the existing memory rather than
+            # inserting a near-duplicate row
+            duplicate_id = self._find_duplicate_memory(user_id, vec)
+            if duplicate_id is not None:
+                if self.db.reinforce_memory(
+                        duplicate_id, self.analyze_importance(memory_content, memory_context)):
+                    created_memory_ids.append(duplicate_id)
+                    continue
+                # The matched row was deleted behind the cache (e.g. via a
+                # database-level delete); reload it and insert normally
+                self._invalidate_user_vectors(user_id)
+
+            memory_id = str(uuid.uuid4())
+            rows.append((
+                memory_id,
+                user_id,
+                memory_content,
+                memory_context,
+                json.dumps([]),
+                self.analyze_importance(memory_content, memory_context),
+                vec.tobytes(),
+            ))
+            created_memory_ids.append(memory_id)
+            vecs.append(vec)
+
+        return created_memory_ids, rows, vecs, extracted_memories
+
+    def process_user_input(self, user_id: str, user_input: str, context: str = "") -> List[str]:
+        """Process user input and automatically create memories"""
+        created_memory_ids, rows, vecs, _ = self._prepare_memory_rows(user_id, user_input, context)
+
+        # One transaction for the whole turn instead of a commit per memory.
+        # rows can be empty while ids are not, when every extracted memory
+        # reinforced an existing one.
+        if rows:
+            self.db.create_memories_bulk(rows)
+            self._append_user_vectors(user_id, [row[0] for row in rows], vecs)
+
+        return created_memory_ids
+    
+    def search_memories_semantic(self, user_id: str, query: str, limit: int = 5) -> List[Dict]:
+        """Rank a user's memories by embedding cosine similarity to the query"""
+        memory_ids, matrix = self._get_user_vectors(user_id)
+        if not memory_ids:
+            return []
+
+        # Vectors are L2-normalized then int8-quantized at insert, so cosine
+        # similarity is an integer dot product rescaled to [-1, 1], computed
+        # for all memories in one matmul over the cached matrix
+        similarities = dot_similarity(matrix, quantize_vector(embed_text(query)))
+
+        # argpartition finds the top-k in O(N); only that slice gets sorted
+        k = min(limit, len(memory_ids))
+        top = np.argpartition(-similarities, k - 1)[:k]
+        top = top[np.argsort(-similarities[top])]
+        hit_ids = [memory_ids[i] for i in top if similarities[i] >= SIMILARITY_THRESHOLD]
+
+        return self.db.get_memories_by_ids(hit_ids)
+
+    def get_relevant_memories(self, user_id: str, query: str = "", limit: int = 5) -> List[Dict]:
+        """Get relevant memories for context"""
+        if query:
+            # Semantic search catches paraphrases that exact-text search misses
+            memories = self.search_memories_semantic(user_id, query, limit)
+            if not memories:
+                memories = self.db.search_memories(user_id, query, limit)
+        else:
+            # Get recent important memories
+            memories = self.db.get_memories(user_id, limit)
+        
+        # Update access counts for retrieved memories in a single statement
+        self.db.update_memory_access_many([memory['id'] for memory in memories])
+
+        return memories
+    
+    def format_memories_for_context(self, memories: List[Dict]) -> str:
+        """Format memories for inclusion in GPT context"""
+        if not memories:
+            return ""
+        
+        context_parts = ["Here's what I remember about you:"]
+        
+        for memory in memories:
+            context_parts.append(f"- {memory['content']}")
+            if memory['tags']:
+                context_parts.append(f"  (Tags: {', '.join(memory['tags'])})")
+        
+        return "\n".join(context_parts)
+    
+    def chat_with_memory(self, user_id: str, user_message: str, 
+                        conversation_history: List[Dict] = None) -> Tuple[str, List[str]]:
+        """Chat with GPT while incorporating memory context"""
+        
+        # Extract new memories from the user input
+        new_memory_ids, rows, vecs, extracted_phrases = self._prepare_memory_rows(user_id, user_message)
+
+        # Serve near-duplicate questions from the semantic response cache
+        # before paying for the network round-trip
+        query_vec = quantize_vector(embed_text(user_message))
+        cached_response = self._get_cached_response(user_id, query_vec)
+        if cached_response is not None:
+            self.db.create_memories_bulk(rows)
+            self._append_user_vectors(user_id, [row[0] for row in rows], vecs)
+            return cached_response, new_memory_ids
+
+        # Get relevant memories for context. Extraction already isolated the
+        # salient phrases, so retrieve with those instead of rescanning the
+        # whole raw message; fall back to the message when nothing matched.
+        retrieval_query = " ".join(extracted_phrases) if extracted_phrases else user_message
+        relevant_memories = self.get_relevant_memories(user_id, retrieval_query, limit=5)
+        memory_context = self.format_memories_for_context(relevant_memories)
+
+        # Write the new memories on the pool so the insert overlaps the
+        # OpenAI round-trip, which dominates end-to-end latency
+        insert_future = _EXECUTOR.submit(self.db.create_memories_bulk, rows)
+        self._append_user_vectors(user_id, [row[0] for row in rows], vecs)
+
+        # Check if OpenAI client is available
+        if not self.client:
+            insert_future.result()
+            return ("OpenAI API key not configured. Please add your API key to the .env file. "
+                   f"However, I created {len(new_memory_ids)} memories from your message: '{user_message}'"), new_memory_ids
+        
+        # Prepare messages for GPT
+        messages = []
+        
+        # Add system message with memory context
+        system_message = "You are a helpful assistant with access to user memories."
+        if memory_context:
+            system_message += f"\n\n{memory_context}"
+        
+        messages.append({"role": "system", "content": system_message})
+        
+        # Add conversation history if provided
+        if conversation_history:
+            messages.extend(conversation_history)
+        
+        # Add current user message
+        messages.append({"role": "user", "content": user_message})
+        
+        # Get response from GPT
+        try:
+            response = self.client.chat.completions.create(
+                model="gpt-3.5-turbo",
+                messages=messages,
+                max_tokens=500,
+                temperature=0.7
+            )
+            
+            assistant_response = response.choices[0].message.content
+            
+            # Process assistant response for potential memories
+            assistant_memory_ids = self.process_user_input(
+                user_id, 
+                assistant_response, 
+                context="Assistant response"
+            )
+            
+            all_new_memory_ids = new_memory_ids + assistant_memory_ids
+
+            self._cache_response(user_id, user_message, query_vec, assistant_response)
+
+            return assistant_response, all_new_memory_ids
+
+        except Exception as e:
+            return f"Error communicating with OpenAI: {str(e)}. Please check your API key and internet connection.", new_memory_ids
+        finally:
+            # Join the background insert so failures surface here and the
+            # rows are durable before we hand back the new ids
+            insert_future.result()
+    
+    def delete_memories_by_keyword(self, user_id: str, keyword: str) -> int:
+        """Delete memories containing a specific keyword"""
+        deleted_count = self.db.delete_user_memories(user_id, keyword)
+        if deleted_count:
+            self._invalidate_user_vectors(user_id)
+        return deleted_count
+    
+    def get_user_memory_stats(self, user_id: str) -> Dict:
+        """Get statistics about user's memories"""
+        # Aggregate in SQL rather than pulling every row into Python; the
+        # recency test is a plain integer comparison on created_at_epoch
+        stats = self.db.get_memory_stats(user_id, int(time.time()) - 7 * 86400)
+
+        if stats['total_memories'] == 0:
+            return {
+                'total_memories': 0,
+                'avg_importance': 0,
+                'most_accessed': None,
+                'recent_memories': 0
+            }
+
+        return {
+            'total_memories': stats['total_memories'],
+            'avg_importance': round(stats['avg_importance'], 2),
+            'most_accessed': self.db.get_most_accessed_memory(user_id),
+            'recent_memories': stats['recent_memories']
+        }
+    
+    def cleanup_old_memories(self, days: int = 365) -> int:
+        """Clean up old, low-importance memories"""
+        deleted_count = self.db.cleanup_old_memories(days)
+        if deleted_count:
+            self._invalidate_user_vectors()
+        return deleted_count